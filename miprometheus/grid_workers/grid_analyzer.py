@@ -33,6 +33,7 @@ import logging
 from datetime import datetime
 
 from miprometheus.grid_workers.grid_worker import GridWorker
+from miprometheus.utils.param_interface import YamlLoader
 
 
 class GridAnalyzer(GridWorker):
@@ -235,7 +236,7 @@ class GridAnalyzer(GridWorker):
 
         # Load yaml file, to get model name, problem name and random seeds.
         with open(os.path.join(experiment_path, 'training_configuration.yaml'), 'r') as yaml_file:
-            params = yaml.load(yaml_file)
+            params = yaml.load(yaml_file, Loader=YamlLoader)
 
         # Get problem and model names - from config.
         status_dict['problem'] = params['testing']['problem']['name']
@@ -243,7 +244,7 @@ class GridAnalyzer(GridWorker):
 
         # Load checkpoint from model file.
         chkpt = torch.load(os.path.join(experiment_path, 'models/model_best.pt'),
-                           map_location=lambda storage, loc: storage)
+                           map_location='cpu')
 
         status_dict['model_save_timestamp'] = '{0:%Y%m%d_%H%M%S}'.format(chkpt['model_timestamp']) 
         status_dict['training_terminal_status'] = chkpt['status']
@@ -295,7 +296,7 @@ class GridAnalyzer(GridWorker):
 
                 # Load yaml file and get random seeds.
                 with open(os.path.join(experiment_test_path, 'testing_configuration.yaml'), 'r') as yaml_file:
-                    test_params = yaml.load(yaml_file)  
+                    test_params = yaml.load(yaml_file, Loader=YamlLoader)
                     # Get seeds.             
                     test_dict['test_seed_torch'] = test_params['testing']['seed_torch']
                     test_dict['test_seed_numpy'] = test_params['testing']['seed_numpy']                    
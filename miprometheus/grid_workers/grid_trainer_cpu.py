@@ -38,6 +38,7 @@ from tempfile import NamedTemporaryFile
 from multiprocessing.pool import ThreadPool
 
 from miprometheus.grid_workers.grid_worker import GridWorker
+from miprometheus.utils.param_interface import YamlLoader
 
 
 class GridTrainerCPU(GridWorker):
@@ -128,7 +129,7 @@ class GridTrainerCPU(GridWorker):
 
         try:  # open file and get parameter dictionary.
             with open(self.flags.config, 'r') as stream:
-                grid_dict = yaml.safe_load(stream)
+                grid_dict = yaml.load(stream, Loader=YamlLoader)
 
         except yaml.YAMLError as e:
             print("Error: Could not properly parse the {} grid configuration file".format(self.flags.config))
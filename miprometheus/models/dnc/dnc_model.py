@@ -89,7 +89,7 @@ class DNC(SequentialModel):
         batch_size = inputs.size(0)
         seq_length = inputs.size(1)
 
-        output = None
+        outputs = []
 
         if self.app_state.visualize:
             self.cell_state_history = []
@@ -113,11 +113,8 @@ class DNC(SequentialModel):
             if output_cell is None:
                 continue
 
-            output_cell = output_cell[..., None, :]
-            if output is None:
-                output = output_cell
-            else:
-                output = torch.cat([output, output_cell], dim=-2)
+            # Collect outputs - they will be stacked once, after the loop.
+            outputs.append(output_cell)
 
             # This is for the time plot
             if self.app_state.visualize:
@@ -131,6 +128,9 @@ class DNC(SequentialModel):
             # if self.plot_active:
             #    self.plot_memory_attention(output, cell_state)
 
+        # Stack outputs along the time axis (-2).
+        output = torch.stack(outputs, dim=-2) if outputs else None
+
         return output
 
     def plot_memory_attention(self, data_dict, predictions, sample_number=0):
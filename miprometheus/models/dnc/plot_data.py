@@ -61,7 +61,7 @@ def plot_memory_attention(prediction, memory, wt_read, wt_write, usage, label):
 
     ax4.xaxis.set_major_locator(matplotlib.ticker.MaxNLocator(integer=True))
     ax4.set_title("Prediction", fontname='Times New Roman', fontsize=15)
-    ax4.imshow(np.transpose((prediction[0, ...]).detach().numpy(), [1, 0]))
+    ax4.imshow(prediction[0, ...].detach().permute(1, 0).numpy())
 
     matplotlib.pyplot.pause(0.2)
 
@@ -114,7 +114,7 @@ class DWM(SequentialModel):
         if self.app_state.visualize:
             self.cell_state_history = []
 
-        output = None
+        outputs = []
         # TODO
         if len(inputs.size()) == 4:
             inputs = inputs[:, 0, :, :]
@@ -142,13 +142,8 @@ class DWM(SequentialModel):
             if output_cell is None:
                 continue
 
-            output_cell = output_cell[..., None, :]
-            if output is None:
-                output = output_cell
-
-            # Concatenate output
-            else:
-                output = torch.cat([output, output_cell], dim=-2)
+            # Collect outputs - they will be stacked once, after the loop.
+            outputs.append(output_cell)
 
             # This is for the time plot
             if self.app_state.visualize:
@@ -157,6 +152,9 @@ class DWM(SequentialModel):
                      cell_state.interface_state.head_weight.detach().numpy(),
                      cell_state.interface_state.snapshot_weight.detach().numpy()))
 
+        # Stack outputs along the time axis (-2).
+        output = torch.stack(outputs, dim=-2) if outputs else None
+
         return output
 
     # Method to change memory size
@@ -98,7 +98,7 @@ class MAECell(Module):
         if os.path.isfile(filename):
             # Load checkpoint from filename.
             chkpt = torch.load(
-                filename, map_location=lambda storage, loc: storage)
+                filename, map_location='cpu')
             # Load controller and interface
             self.controller.load_state_dict(chkpt['ctrl_dict'])
             self.interface.load_state_dict(chkpt['interface_dict'])
@@ -133,7 +133,7 @@ class MAECell(Module):
         # Save the intermediate checkpoint.
         if save_intermediate:
             # Generate filename pt.
-            filename = model_dir + 'encoder_episode_{:05d}.pt'.format(episode)
+            filename = os.path.join(model_dir, 'encoder_episode_{:05d}.pt'.format(episode))
             # Save dictionary to file.
             torch.save(chkpt, filename)
             logger.info(
@@ -143,7 +143,7 @@ class MAECell(Module):
         # Save the best model.
         if is_best_model:
             # Generate filename pt.
-            filename = model_dir + 'encoder_best.pt'
+            filename = os.path.join(model_dir, 'encoder_best.pt')
             # Save dictionary to file.
             torch.save(chkpt, filename)
             logger.info(
@@ -191,13 +191,14 @@ class MAECell(Module):
         return MAECellStateTuple(
             ctrl_init_state, interface_init_state, init_memory_BxAxC)
 
-    def forward(self, inputs_BxI, prev_cell_state):
+    def step_hidden(self, inputs_BxI, prev_cell_state):
         """
-        Forward function of NTM cell.
+        Executes a single step of the cell without the output layer.
 
         :param inputs_BxI: a Tensor of input data of size [BATCH_SIZE  x INPUT_SIZE]
         :param  prev_cell_state: a MAECellStateTuple tuple, containing previous state of the cell.
-        :returns: MAECellStateTuple tuple containing current cell state.
+        :returns: Controller output [BATCH_SIZE x CONTROLLER_HIDDEN_SIZE] and MAECellStateTuple tuple \
+        containing current cell state.
 
         """
         # Unpack previous cell  state.
@@ -213,12 +214,42 @@ class MAECell(Module):
         memory_BxAxC, interface_state_tuple = self.interface(
             ctrl_output_BxH, prev_memory_BxAxC, prev_interface_state_tuple)
 
-        # Output layer - takes controller hidden state.
-        logits_BxO = self.hidden2output(ctrl_output_BxH)
-
         # Pack current cell state.
         cell_state_tuple = MAECellStateTuple(
             ctrl_state_tuple, interface_state_tuple, memory_BxAxC)
 
+        # Return controller output and current cell state.
+        return ctrl_output_BxH, cell_state_tuple
+
+    def project_outputs(self, ctrl_outputs_TxBxH):
+        """
+        Applies the output layer to controller outputs collected from many steps at once, so the projection \
+        is done by a single matrix multiplication.
+
+        :param ctrl_outputs_TxBxH: a Tensor of controller outputs of size [SEQ_LENGTH x BATCH_SIZE x CONTROLLER_HIDDEN_SIZE]
+        :returns: Logits of size [SEQ_LENGTH x BATCH_SIZE x OUTPUT_SIZE].
+
+        """
+        seq_length, batch_size, hidden_size = ctrl_outputs_TxBxH.size()
+        logits = self.hidden2output(
+            ctrl_outputs_TxBxH.contiguous().view(seq_length * batch_size, hidden_size))
+        return logits.view(seq_length, batch_size, self.output_size)
+
+    def forward(self, inputs_BxI, prev_cell_state):
+        """
+        Forward function of NTM cell.
+
+        :param inputs_BxI: a Tensor of input data of size [BATCH_SIZE  x INPUT_SIZE]
+        :param  prev_cell_state: a MAECellStateTuple tuple, containing previous state of the cell.
+        :returns: MAECellStateTuple tuple containing current cell state.
+
+        """
+        # Execute controller and interface.
+        ctrl_output_BxH, cell_state_tuple = self.step_hidden(
+            inputs_BxI, prev_cell_state)
+
+        # Output layer - takes controller hidden state.
+        logits_BxO = self.hidden2output(ctrl_output_BxH)
+
         # Return logits and current cell state.
         return logits_BxO, cell_state_tuple
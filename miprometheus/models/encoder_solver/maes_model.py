@@ -171,7 +171,8 @@ class MAES(SequentialModel):
         # Start as encoder.
         mode = self.modes.Encode
 
-        # Logits container.
+        # Containers for encoder controller outputs and solver logits.
+        encoder_outputs = []
         logits = []
 
         for x in inputs_BxSxI.chunk(inputs_BxSxI.size(1), dim=1):
@@ -196,17 +197,26 @@ class MAES(SequentialModel):
                 exit(-1)
 
             # Run encoder or solver - depending on the state.
+            # Encoder outputs are projected to logits after the loop.
             if mode == self.modes.Encode:
-                logit, encoder_state = self.encoder(x, encoder_state)
+                ctrl_output, encoder_state = self.encoder.step_hidden(x, encoder_state)
+                encoder_outputs += [ctrl_output]
             elif mode == self.modes.Solve:
                 logit, solver_state = self.solver(x, solver_state)
-
-            # Collect logits from both encoder and solver - they will be masked
-            # afterwards.
-            logits += [logit]
-
-        # Stack logits along the temporal (sequence) axis.
-        logits = torch.stack(logits, 1)
+                logits += [logit]
+
+        # Collect logits from both encoder and solver - they will be masked
+        # afterwards. Encoder steps always precede the solver ones.
+        all_logits = []
+        if encoder_outputs:
+            # Project all encoder steps at once [BATCH_SIZE x ENC_LENGTH x OUTPUT_SIZE].
+            all_logits += [self.encoder.project_outputs(
+                torch.stack(encoder_outputs, 0)).transpose(0, 1)]
+        if logits:
+            all_logits += [torch.stack(logits, 1)]
+
+        # Concatenate logits along the temporal (sequence) axis.
+        logits = torch.cat(all_logits, 1)
         return logits
 
 
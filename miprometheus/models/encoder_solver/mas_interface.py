@@ -29,6 +29,7 @@ logger = logging.getLogger('MAS-Interface')
 # logging.basicConfig(level=logging.DEBUG)
 
 from miprometheus.utils.app_state import AppState
+from miprometheus.models.ntm.ntm_interface import circular_convolution
 
 
 # Helper collection type.
@@ -87,6 +88,9 @@ class MASInterface(Module):
         self.hidden2read_params = torch.nn.Linear(
             self.ctrl_hidden_state_size, num_read_params)
 
+        # Cache of indices used in circular convolution (see ntm_interface.circular_convolution).
+        self.ext_indices_cache = {}
+
     def init_state(self, batch_size, num_memory_addresses,
                    final_encoder_attention_BxAx1):
         """
@@ -279,66 +283,7 @@ class MASInterface(Module):
         :returns: attention vector of size [BATCH_SIZE x ADDRESS_SIZE x 1]
 
         """
-        def circular_index(idx, num_addr):
-            """
-            Calculates the index, taking into consideration the number of
-            addresses in memory.
-
-            :param idx: index (single element)
-            :param num_addr: number of addresses in memory
-
-            """
-            if idx < 0:
-                return num_addr + idx
-            elif idx >= num_addr:
-                return idx - num_addr
-            else:
-                return idx
-
-        # Check whether inputs are already on GPU or not.
-        #dtype = torch.cuda.LongTensor if attention_BxAx1.is_cuda else torch.LongTensor
-        dtype = AppState().LongTensor
-
-        # Get number of memory addresses and batch size.
-        batch_size = prev_memory_BxAxC.size(0)
-        num_addr = prev_memory_BxAxC.size(1)
-        shift_size = self.interface_shift_size
-
-        #logger.debug("shift_BxSx1 {}: {}".format(shift_BxSx1,  shift_BxSx1.size()))
-        # Create an extended list of indices indicating what elements of the
-        # sequence will be where.
-        ext_indices_tensor = torch.Tensor(
-            [circular_index(shift, num_addr)
-             for shift in range(
-                 -shift_size // 2 + 1, num_addr + shift_size // 2)]).type(dtype)
-        #logger.debug("ext_indices {}:\n {}".format(ext_indices_tensor.size(),  ext_indices_tensor))
-
-        # Use indices for creation of an extended attention vector.
-        ext_attention_BxEAx1 = torch.index_select(
-            attention_BxAx1, dim=1, index=ext_indices_tensor)
-        #logger.debug("ext_attention_BxEAx1 {}:\n {}".format(ext_attention_BxEAx1.size(),  ext_attention_BxEAx1))
-
-        # Transpose inputs to convolution.
-        ext_att_trans_Bx1xEA = torch.transpose(ext_attention_BxEAx1, 1, 2)
-        shift_trans_Bx1xS = torch.transpose(shift_BxSx1, 1, 2)
-        # Perform  convolution for every batch-filter pair.
-        tmp_attention_list = []
-        for b in range(batch_size):
-            tmp_attention_list.append(torch.nn.functional.conv1d(ext_att_trans_Bx1xEA.narrow(
-                0, b, 1), shift_trans_Bx1xS.narrow(0, b, 1)))
-        # Concatenate list into a single tensor.
-        shifted_attention_BxAx1 = torch.transpose(
-            torch.cat(tmp_attention_list, dim=0), 1, 2)
-        #logger.debug("shifted_attention_BxAx1 {}:\n {}".format(shifted_attention_BxAx1.size(),  shifted_attention_BxAx1))
-
-        # Manual test of convolution
-        #sum = 0
-        #el =0
-        #b = 0
-        # for i in range(3):
-        #    sum += ext_attention_BxEAx1[b][el+i][0] * shift_BxSx1[b][i][0]
-        #print("SUM= ", sum)
-        return shifted_attention_BxAx1
+        return circular_convolution(attention_BxAx1, shift_BxSx1, self.ext_indices_cache)
 
     def sharpening(self, attention_BxAx1, gamma_Bx1x1):
         """
@@ -308,7 +308,7 @@ class Model(Module):
         elif self.best_status != training_status:
             filename = model_dir + 'model_best.pt'
             # Load checkpoint.
-            chkpt_loaded = torch.load(filename, map_location=lambda storage, loc: storage)
+            chkpt_loaded = torch.load(filename, map_location='cpu')
             # Update status and status time.
             chkpt_loaded['status'] = training_status
             chkpt_loaded['status_timestamp'] = datetime.now()
@@ -328,7 +328,7 @@ class Model(Module):
         # Load checkpoint
         # This is to be able to load a CUDA-trained model on CPU
         chkpt = torch.load(
-            checkpoint_file, map_location=lambda storage, loc: storage)
+            checkpoint_file, map_location='cpu')
 
         # Load model.
         self.load_state_dict(chkpt['state_dict'])
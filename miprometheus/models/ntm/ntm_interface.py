@@ -53,6 +53,53 @@ class InterfaceStateTuple(_InterfaceStateTuple):
     __slots__ = ()
 
 
+def circular_convolution(attention_BxAx1, shift_BxSx1, ext_indices_cache):
+    """
+    Performs circular convolution, i.e. shitfts the attention accodring to
+    given shift vector (convolution mask).
+
+    Shared by the NTM interface and the interfaces of the encoder-solver models.
+
+    :param attention_BxAx1: Current attention [BATCH_SIZE x ADDRESS_SIZE x 1]
+    :param shift_BxSx1: soft shift maks (convolutional kernel) [BATCH_SIZE x SHIFT_SIZE x 1]
+    :param ext_indices_cache: Dictionary caching the extended indices (owned by the calling interface).
+    :returns: attention vector of size [BATCH_SIZE x ADDRESS_SIZE x 1]
+
+    """
+    # Get number of memory addresses, batch size and shift size.
+    batch_size = attention_BxAx1.size(0)
+    num_addr = attention_BxAx1.size(1)
+    shift_size = shift_BxSx1.size(1)
+
+    #logger.debug("shift_BxSx1 {}: {}".format(shift_BxSx1,  shift_BxSx1.size()))
+    # Get the extended list of indices indicating what elements of the
+    # sequence will be where - they depend only on the number of addresses
+    # (and the shift size), and are kept on the device pointed by AppState.
+    long_dtype = AppState().LongTensor
+    key = (num_addr, shift_size, long_dtype)
+    ext_indices_tensor = ext_indices_cache.get(key)
+    if ext_indices_tensor is None:
+        ext_indices_tensor = torch.from_numpy(
+            np.arange(-shift_size // 2 + 1, num_addr + shift_size // 2) % num_addr
+            ).type(long_dtype)
+        ext_indices_cache[key] = ext_indices_tensor
+    #logger.debug("ext_indices {}:\n {}".format(ext_indices_tensor.size(),  ext_indices_tensor))
+
+    # Use indices for creation of an extended attention vector.
+    ext_attention_BxEAx1 = torch.index_select(
+        attention_BxAx1, dim=1, index=ext_indices_tensor)
+    #logger.debug("ext_attention_BxEAx1 {}:\n {}".format(ext_attention_BxEAx1.size(),  ext_attention_BxEAx1))
+
+    # Sliding windows of the extended attention - one window of SHIFT_SIZE elements
+    # per address (view, no copy) [BATCH_SIZE x ADDRESS_SIZE x SHIFT_SIZE].
+    windows_BxAxS = ext_attention_BxEAx1.view(batch_size, -1).unfold(1, shift_size, 1)
+    # Perform convolution for all batch-filter pairs at once (batched matrix multiplication).
+    shifted_attention_BxAx1 = torch.bmm(windows_BxAxS, shift_BxSx1)
+    #logger.debug("shifted_attention_BxAx1 {}:\n {}".format(shifted_attention_BxAx1.size(),  shifted_attention_BxAx1))
+
+    return shifted_attention_BxAx1
+
+
 class NTMInterface(Module):
     """
     Class realizing interface between controller and memory.
@@ -111,11 +158,10 @@ class NTMInterface(Module):
                 'shift': self.interface_shift_size, 'gamma': 1}, "Read")
             assert num_read_params == self.read_param_locations[-1], "Last location must be equal to number of read params."
 
-       # Forward linear layers that generate parameters of read heads.
-        self.hidden2read_list = torch.nn.ModuleList()
-        for _ in range(self.interface_num_read_heads):
-            self.hidden2read_list.append(torch.nn.Linear(
-                self.ctrl_hidden_state_size, num_read_params))
+        # Store the number of parameters of a single read head - used for reshaping.
+        self.num_read_params = num_read_params
+        # Sizes of read parameters - used during splitting.
+        self.read_param_sizes = np.diff(self.read_param_locations).tolist()
 
         # -------------- WRITE HEAD -----------------#
         # Number/size of wrrite parameters:
@@ -150,9 +196,23 @@ class NTMInterface(Module):
             assert num_write_params == self.write_param_locations[
                 -1], "Last location must be equal to number of write params."
 
-       # Forward linear layer that generates parameters of write heads.
-        self.hidden2write_params = torch.nn.Linear(
-            self.ctrl_hidden_state_size, num_write_params)
+        # Sizes of write parameters - used during splitting.
+        self.write_param_sizes = np.diff(self.write_param_locations).tolist()
+
+        # Sizes of parameters of all read heads and of the write head - used for splitting the output of the layer below.
+        self.read_write_param_sizes = [self.interface_num_read_heads * num_read_params, num_write_params]
+
+       # Forward linear layer that generates parameters of all read heads and the write head at once.
+        self.hidden2all_params = torch.nn.Linear(
+            self.ctrl_hidden_state_size, sum(self.read_write_param_sizes))
+
+        # Cache of indices used in circular convolution, indexed by the number of memory addresses,
+        # the shift size and the tensor type pointed by AppState (so the indices follow changes of the device).
+        self.ext_indices_cache = {}
+
+        # Cache of initial state tensors, indexed by the number of memory addresses
+        # and the tensor type pointed by AppState (so the tensors follow changes of the type/device).
+        self.init_state_cache = {}
 
     def init_state(self, batch_size, num_memory_addresses):
         """
@@ -163,24 +223,32 @@ class NTMInterface(Module):
         :returns: Initial state tuple - object of InterfaceStateTuple class.
 
         """
+        # Get templates of the initial state (for a single sample) - created once per number of addresses.
         dtype = AppState().dtype
-        # Add read head states - one for each read head.
+        templates = self.init_state_cache.get((num_memory_addresses, dtype))
+        if templates is None:
 
-        read_state_tuples = []
+            # Initial  attention weights [1 x MEMORY_ADDRESSES x 1]
+            # Initialize attention: to address 0.
+            zh_attention = torch.zeros(1, num_memory_addresses, 1).type(dtype)
+            zh_attention[:, 0, 0] = 1
+
+            # Initialize gating: to previous attention (i.e. zero-hard).
+            init_gating = torch.ones(1, 1, 1).type(dtype)
 
-        # Initial  attention weights [BATCH_SIZE x MEMORY_ADDRESSES x 1]
-        # Initialize attention: to address 0.
-        zh_attention = torch.zeros(
-            batch_size, num_memory_addresses, 1).type(dtype)
-        zh_attention[:, 0, 0] = 1
+            # Initialize shift - to zero.
+            init_shift = torch.zeros(1, self.interface_shift_size, 1).type(dtype)
+            init_shift[:, 1, 0] = 1
 
-        # Initialize gating: to previous attention (i.e. zero-hard).
-        init_gating = torch.ones(batch_size, 1, 1).type(dtype)
+            templates = (zh_attention, init_gating, init_shift)
+            self.init_state_cache[(num_memory_addresses, dtype)] = templates
 
-        # Initialize shift - to zero.
-        init_shift = torch.zeros(
-            batch_size, self.interface_shift_size, 1).type(dtype)
-        init_shift[:, 1, 0] = 1
+        # Expand the templates to the batch size (views, no copy).
+        zh_attention, init_gating, init_shift = [
+            template.expand(batch_size, *template.size()[1:]) for template in templates]
+
+        # Add read head states - one for each read head.
+        read_state_tuples = []
 
         for i in range(self.interface_num_read_heads):
 
@@ -219,70 +287,80 @@ class NTMInterface(Module):
 
         # !! Execute single step !!
 
-        # Read attentions
-        read_attentions_BxAx1_H = []
-        # List of read vectors - with two dimensions! [BATCH_SIZE x
-        # CONTENT_SIZE]
-        read_vectors_BxC_H = []
-        # List of read tuples - for visualization.
-        read_state_tuples = []
+        # Get batch size and number of memory addresses.
+        batch_size = prev_memory_BxAxC.size(0)
+        num_memory_addresses = prev_memory_BxAxC.size(1)
+        num_heads = self.interface_num_read_heads
 
-        # Read heads.
-        for i in range(self.interface_num_read_heads):
-            # Calculate parameters of a given read head.
-            params_BxP = self.hidden2read_list[i](ctrl_hidden_state_BxH)
-
-            if self.use_content_based_addressing:
-                # Split the parameters.
-                query_vector_BxC, beta_Bx1, gate_Bx1, shift_BxS, gamma_Bx1 = self.split_params(
-                    params_BxP, self.read_param_locations)
-                # Update the attention of a given read head.
-                read_attention_BxAx1, read_state_tuple = self.update_attention(
-                    query_vector_BxC, beta_Bx1, gate_Bx1, shift_BxS, gamma_Bx1,
-                    prev_memory_BxAxC, prev_read_attentions_BxAx1_H[i])
-            else:
-                # Split the parameters.
-                shift_BxS, gamma_Bx1 = self.split_params(
-                    params_BxP, self.read_param_locations)
-                # Update the attention of a given read head.
-                read_attention_BxAx1, read_state_tuple = self.update_attention(
-                    _, _, _, shift_BxS, gamma_Bx1, prev_memory_BxAxC, prev_read_attentions_BxAx1_H[i])
-
-            # Read vector from memory [BATCH_SIZE x CONTENT_BITS].
-            read_vector_BxC = self.read_from_memory(
-                read_attention_BxAx1, prev_memory_BxAxC)
-
-            # Save read attentions and vectors in a list.
-            read_attentions_BxAx1_H.append(read_attention_BxAx1)
-            read_vectors_BxC_H.append(read_vector_BxC)
-            # We always collect tuples, as we are using e.g. attentions from
-            # them.
-            read_state_tuples.append(read_state_tuple)
+        # Normalize memory along content - once for all heads (used only by content-based addressing).
+        norm_memory_BxAxC = torch.nn.functional.normalize(prev_memory_BxAxC, p=2, dim=2) \
+            if self.use_content_based_addressing else None
+
+        # Calculate parameters of all read heads and the write head with a single layer.
+        read_params_BxNP, write_params_BxP = self.split_params(
+            self.hidden2all_params(ctrl_hidden_state_BxH), self.read_write_param_sizes)
+
+        # All read heads are processed at once - heads are merged with the batch dimension,
+        # i.e. BN below stands for [BATCH_SIZE * NUM_HEADS].
+        # Parameters of all read heads [BATCH_SIZE * NUM_HEADS x NUM_READ_PARAMS].
+        params_BNxP = read_params_BxNP.contiguous().view(
+            batch_size * num_heads, self.num_read_params)
+
+        # Previous attentions of all read heads [BATCH_SIZE * NUM_HEADS x MEMORY_ADDRESSES x 1].
+        prev_read_attention_BNxAx1 = torch.stack(prev_read_attentions_BxAx1_H, dim=1).view(
+            batch_size * num_heads, num_memory_addresses, 1)
+
+        if self.use_content_based_addressing:
+            # Split the parameters.
+            query_vector_BNxC, beta_BNx1, gate_BNx1, shift_BNxS, gamma_BNx1 = self.split_params(
+                params_BNxP, self.read_param_sizes)
+            # Update the attentions of all read heads.
+            read_attention_BNxAx1, read_state_tuple = self.update_attention(
+                query_vector_BNxC, beta_BNx1, gate_BNx1, shift_BNxS, gamma_BNx1,
+                norm_memory_BxAxC, prev_read_attention_BNxAx1)
+        else:
+            # Split the parameters.
+            shift_BNxS, gamma_BNx1 = self.split_params(
+                params_BNxP, self.read_param_sizes)
+            # Update the attentions of all read heads.
+            read_attention_BNxAx1, read_state_tuple = self.update_attention(
+                _, _, _, shift_BNxS, gamma_BNx1, norm_memory_BxAxC, prev_read_attention_BNxAx1)
+
+        # Read vectors of all heads from memory at once [BATCH_SIZE x NUM_HEADS x CONTENT_BITS].
+        read_vectors_BxNxC = torch.bmm(
+            read_attention_BNxAx1.view(batch_size, num_heads, num_memory_addresses), prev_memory_BxAxC)
+        # List of read vectors - with two dimensions! [BATCH_SIZE x CONTENT_SIZE]
+        read_vectors_BxC_H = list(read_vectors_BxNxC.unbind(1))
+
+        # List of read tuples (one per head) - for visualization.
+        # We always collect tuples, as we are using e.g. attentions from them.
+        read_state_tuples = [HeadStateTuple(*head_state) for head_state in zip(
+            *[field.view(batch_size, num_heads, *field.size()[1:]).unbind(1) for field in read_state_tuple])]
 
         # Write head operation.
-        # Calculate parameters of a given read head.
-        params_BxP = self.hidden2write_params(ctrl_hidden_state_BxH)
+        # Parameters of the write head.
+        params_BxP = write_params_BxP
 
         if self.use_content_based_addressing:
             # Split the parameters.
             query_vector_BxC, beta_Bx1, gate_Bx1, shift_BxS, gamma_Bx1, erase_vector_BxC, add_vector_BxC = self.split_params(
-                params_BxP, self.write_param_locations)
+                params_BxP, self.write_param_sizes)
             # Update the attention of the write head.
             write_attention_BxAx1, write_state_tuple = self.update_attention(
                 query_vector_BxC, beta_Bx1, gate_Bx1, shift_BxS, gamma_Bx1,
-                prev_memory_BxAxC, prev_write_attention_BxAx1)
+                norm_memory_BxAxC, prev_write_attention_BxAx1)
         else:
             # Split the parameters.
             shift_BxS, gamma_Bx1, erase_vector_BxC, add_vector_BxC = self.split_params(
-                params_BxP, self.write_param_locations)
+                params_BxP, self.write_param_sizes)
             # Update the attention of the write head.
             write_attention_BxAx1, write_state_tuple = self.update_attention(
-                _, _, _, shift_BxS, gamma_Bx1, prev_memory_BxAxC, prev_write_attention_BxAx1)
+                _, _, _, shift_BxS, gamma_Bx1, norm_memory_BxAxC, prev_write_attention_BxAx1)
 
         # Add 3rd dimensions where required and apply non-linear transformations.
         # I didn't had that non-linear transformation in TF!
-        erase_vector_Bx1xC = torch.nn.functional.sigmoid(erase_vector_BxC).unsqueeze(1)
-        add_vector_Bx1xC = torch.nn.functional.sigmoid(add_vector_BxC).unsqueeze(1)
+        erase_vector_Bx1xC = torch.sigmoid(erase_vector_BxC).unsqueeze(1)
+        add_vector_Bx1xC = torch.sigmoid(add_vector_BxC).unsqueeze(1)
 
         #logger.debug("write_attention_BxAx1 {}:\n {}".format(write_attention_BxAx1.size(),  write_attention_BxAx1))
 
@@ -319,12 +397,11 @@ class NTMInterface(Module):
         #logger.debug("{} param locations:\n {}".format(head_name, param_locations))
         return param_locations
 
-    def split_params(self, params, locations):
+    def split_params(self, params, sizes):
         """
-        Split parameters into list on the basis of locations.
+        Split parameters into list on the basis of their sizes (single split along the last dimension).
         """
-        param_splits = [params[..., locations[i]:locations[i + 1]]
-                        for i in range(len(locations) - 1)]
+        param_splits = params.split(sizes, dim=-1)
         #logger.debug("Splitted params:\n {}".format(param_splits))
         return param_splits
 
@@ -335,17 +412,19 @@ class NTMInterface(Module):
             gate_Bx1,
             shift_BxS,
             gamma_Bx1,
-            prev_memory_BxAxC,
+            norm_memory_BxAxC,
             prev_attention_BxAx1):
         """
-        Updates the attention weights.
+        Updates the attention weights. Can update attentions of many heads accessing the same memory at once - \
+        in that case heads are merged with the batch dimension (i.e. BATCH_SIZE stands for BATCH_SIZE * NUM_HEADS, \
+        apart of the memory).
 
         :param query_vector_BxC: Query used for similarity calculation in content-based addressing [BATCH_SIZE x CONTENT_BITS]
         :param beta_Bx1: Strength parameter used in content-based addressing.
         :param gate_Bx1:
         :param shift_BxS:
         :param gamma_Bx1:
-        :param prev_memory_BxAxC: tensor containing memory before update [BATCH_SIZE x MEMORY_ADDRESSES x CONTENT_BITS]
+        :param norm_memory_BxAxC: memory before update, normalized along content [BATCH_SIZE x MEMORY_ADDRESSES x CONTENT_BITS] (used only by content-based addressing)
         :param prev_attention_BxAx1: previous attention vector [BATCH_SIZE x MEMORY_ADDRESSES x 1]
         :returns: attention vector of size [BATCH_SIZE x ADDRESS_SIZE x 1]
 
@@ -359,20 +438,21 @@ class NTMInterface(Module):
         if self.use_content_based_addressing:
             # Add 3rd dimensions where required and apply non-linear transformations.
             # Produce content-addressing params.
-            query_vector_Bx1xC = torch.nn.functional.sigmoid(query_vector_BxC).unsqueeze(1)
+            query_vector_Bx1xC = torch.sigmoid(query_vector_BxC).unsqueeze(1)
             # Beta: oneplus
             beta_Bx1x1 = torch.nn.functional.softplus(beta_Bx1).unsqueeze(2) + 1
             # Produce gating param.
-            gate_Bx1x1 = torch.nn.functional.sigmoid(gate_Bx1).unsqueeze(2)
+            gate_Bx1x1 = torch.sigmoid(gate_Bx1).unsqueeze(2)
 
             # Content-based addressing.
             content_attention_BxAx1 = self.content_based_addressing(
-                query_vector_Bx1xC, beta_Bx1x1, prev_memory_BxAxC)
+                query_vector_Bx1xC, beta_Bx1x1, norm_memory_BxAxC)
 
             # Gating mechanism - choose beetween new attention from CBA or
             # attention from previous iteration. [BATCH_SIZE x ADDRESSES x 1].
-            attention_after_gating_BxAx1 = gate_Bx1x1 * content_attention_BxAx1 + \
-                (torch.ones_like(gate_Bx1x1) - gate_Bx1x1) * prev_attention_BxAx1
+            # (interpolation written as prev + gate * (content - prev), without a tensor of ones).
+            attention_after_gating_BxAx1 = prev_attention_BxAx1 + \
+                gate_Bx1x1 * (content_attention_BxAx1 - prev_attention_BxAx1)
             #logger.debug("attention_after_gating_BxAx1 {}:\n {}".format(attention_after_gating_BxAx1.size(),  attention_after_gating_BxAx1))
 
             # Location-based addressing.
@@ -398,33 +478,33 @@ class NTMInterface(Module):
         return location_attention_BxAx1, head_tuple
 
     def content_based_addressing(
-            self, query_vector_Bx1xC, beta_Bx1x1, prev_memory_BxAxC):
+            self, query_vector_Bx1xC, beta_Bx1x1, norm_memory_BxAxC):
         """
         Computes content-based addressing. Uses query vectors for calculation
         of similarity.
 
-        :param query_vector_Bx1xC: NTM "key"  [BATCH_SIZE x 1 x CONTENT_BITS]
-        :param beta_Bx1x1: key strength [BATCH_SIZE x 1 x 1]
-        :param prev_memory_BxAxC: tensor containing memory before update [BATCH_SIZE x MEMORY_ADDRESSES x CONTENT_BITS]
-        :returns: attention of size [BATCH_SIZE x ADDRESS_SIZE x 1]
+        :param query_vector_Bx1xC: NTM "keys" of all heads  [BATCH_SIZE * NUM_HEADS x 1 x CONTENT_BITS]
+        :param beta_Bx1x1: key strength [BATCH_SIZE * NUM_HEADS x 1 x 1]
+        :param norm_memory_BxAxC: memory before update, normalized along content [BATCH_SIZE x MEMORY_ADDRESSES x CONTENT_BITS]
+        :returns: attention of size [BATCH_SIZE * NUM_HEADS x ADDRESS_SIZE x 1]
 
         """
         # Normalize query batch - along content.
         norm_query_vector_Bx1xC = torch.nn.functional.normalize(query_vector_Bx1xC, p=2, dim=2)
         #logger.debug("norm_query_vector_Bx1xC {}:\n {}".format(norm_query_vector_Bx1xC.size(),  norm_query_vector_Bx1xC))
 
-        # Normalize memory - along content.
-        norm_memory_BxAxC = torch.nn.functional.normalize(prev_memory_BxAxC, p=2, dim=2)
-        #logger.debug("norm_memory_BxAxC {}:\n {}".format(norm_memory_BxAxC.size(),  norm_memory_BxAxC))
+        # Queries of all heads accessing the same memory [BATCH_SIZE x NUM_HEADS x CONTENT_BITS].
+        batch_size, num_addr, num_bits = norm_memory_BxAxC.size()
+        norm_query_vector_BxNxC = norm_query_vector_Bx1xC.view(batch_size, -1, num_bits)
 
-        # Calculate cosine similarity [BATCH_SIZE x MEMORY_ADDRESSES x 1].
-        similarity_BxAx1 = torch.matmul(
-            norm_memory_BxAxC, torch.transpose(norm_query_vector_Bx1xC, 1, 2))
+        # Calculate cosine similarity of all heads with a single einsum (one batched matrix multiplication,
+        # without replicating the memory for every head) [BATCH_SIZE * NUM_HEADS x MEMORY_ADDRESSES x 1].
+        similarity_BxAx1 = torch.einsum(
+            'bac,bnc->bna', (norm_memory_BxAxC, norm_query_vector_BxNxC)).contiguous().view(-1, num_addr, 1)
         #logger.debug("similarity_BxAx1 {}:\n {}".format(similarity_BxAx1.size(),  similarity_BxAx1))
 
         # Element-wise multiplication [BATCH_SIZE x MEMORY_ADDRESSES x 1]
-        strengthtened_similarity_BxAx1 = torch.matmul(
-            similarity_BxAx1, beta_Bx1x1)
+        strengthtened_similarity_BxAx1 = similarity_BxAx1 * beta_Bx1x1
         #logger.debug("strengthtened_similarity_BxAx1 {}:\n {}".format(strengthtened_similarity_BxAx1.size(),  strengthtened_similarity_BxAx1))
 
         # Calculate attention based on similarity along the "slot dimension"
@@ -465,59 +545,7 @@ class NTMInterface(Module):
         :returns: attention vector of size [BATCH_SIZE x ADDRESS_SIZE x 1]
 
         """
-        def circular_index(idx, num_addr):
-            """
-            Calculates the index, taking into consideration the number of
-            addresses in memory.
-
-            :param idx: index (single element)
-            :param num_addr: number of addresses in memory
-
-            """
-            if idx < 0:
-                return num_addr + idx
-            elif idx >= num_addr:
-                return idx - num_addr
-            else:
-                return idx
-
-        # Check whether inputs are already on GPU or not.
-        #dtype = torch.cuda.LongTensor if attention_BxAx1.is_cuda else torch.LongTensor
-        dtype = AppState().LongTensor
-
-        # Get number of memory addresses and batch size.
-        batch_size = attention_BxAx1.size(0)
-        num_addr = attention_BxAx1.size(1)
-        shift_size = self.interface_shift_size
-
-        #logger.debug("shift_BxSx1 {}: {}".format(shift_BxSx1,  shift_BxSx1.size()))
-        # Create an extended list of indices indicating what elements of the
-        # sequence will be where.
-        ext_indices_tensor = torch.Tensor(
-            [circular_index(shift, num_addr)
-             for shift in range(
-                 -shift_size // 2 + 1, num_addr + shift_size // 2)]).type(dtype)
-        #logger.debug("ext_indices {}:\n {}".format(ext_indices_tensor.size(),  ext_indices_tensor))
-
-        # Use indices for creation of an extended attention vector.
-        ext_attention_BxEAx1 = torch.index_select(
-            attention_BxAx1, dim=1, index=ext_indices_tensor)
-        #logger.debug("ext_attention_BxEAx1 {}:\n {}".format(ext_attention_BxEAx1.size(),  ext_attention_BxEAx1))
-
-        # Transpose inputs to convolution.
-        ext_att_trans_Bx1xEA = torch.transpose(ext_attention_BxEAx1, 1, 2)
-        shift_trans_Bx1xS = torch.transpose(shift_BxSx1, 1, 2)
-        # Perform  convolution for every batch-filter pair.
-        tmp_attention_list = []
-        for b in range(batch_size):
-            tmp_attention_list.append(torch.nn.functional.conv1d(ext_att_trans_Bx1xEA.narrow(
-                0, b, 1), shift_trans_Bx1xS.narrow(0, b, 1)))
-        # Concatenate list into a single tensor.
-        shifted_attention_BxAx1 = torch.transpose(
-            torch.cat(tmp_attention_list, dim=0), 1, 2)
-        #logger.debug("shifted_attention_BxAx1 {}:\n {}".format(shifted_attention_BxAx1.size(),  shifted_attention_BxAx1))
-
-        return shifted_attention_BxAx1
+        return circular_convolution(attention_BxAx1, shift_BxSx1, self.ext_indices_cache)
 
     def sharpening(self, attention_BxAx1, gamma_Bx1x1):
         """
@@ -528,12 +556,10 @@ class NTMInterface(Module):
         :returns: attention vector of size [BATCH_SIZE x ADDRESS_SIZE x 1]
 
         """
-        # Power.
-        pow_attention_BxAx1 = torch.pow(attention_BxAx1 + 1e-12, gamma_Bx1x1)
-        #logger.error("pow_attention_BxAx1 {}:\n {}".format(pow_attention_BxAx1.size(),  pow_attention_BxAx1))
-
-        # Normalize along addresses.
-        norm_attention_BxAx1 = torch.nn.functional.normalize(pow_attention_BxAx1, p=1, dim=1)
+        # Power followed by normalization along addresses, computed in log-domain:
+        # (a^gamma) / sum(a^gamma) == softmax(gamma * log(a)), which is numerically stable.
+        norm_attention_BxAx1 = torch.nn.functional.softmax(
+            gamma_Bx1x1 * torch.log(attention_BxAx1 + 1e-12), dim=1)
         #logger.error("EEEE norm_attention_BxAx1 {}:\n {}".format(norm_attention_BxAx1.size(),  norm_attention_BxAx1))
 
         return norm_attention_BxAx1
@@ -568,13 +594,14 @@ class NTMInterface(Module):
         :returns: vector read from the memory [BATCH_SIZE x CONTENT_BITS]
 
         """
-        # 1. Calculate the preserved content.
-        preserve_content_BxAxC = 1 - \
-            torch.matmul(write_attention_BxAx1, erase_vector_Bx1xC)
+        # 1. Calculate the preserved content (1 - erased, computed in place on the fresh bmm result).
+        preserve_content_BxAxC = torch.bmm(
+            write_attention_BxAx1, erase_vector_Bx1xC).neg_().add_(1)
         # 2. Calculate the added content.
-        add_content_BxAxC = torch.matmul(
+        add_content_BxAxC = torch.bmm(
             write_attention_BxAx1, add_vector_Bx1xC)
-        # 3. Update memory.
-        memory_BxAxC = prev_memory_BxAxC * preserve_content_BxAxC + add_content_BxAxC
+        # 3. Update memory: add + prev * preserve in a single fused operation.
+        memory_BxAxC = torch.addcmul(
+            add_content_BxAxC, prev_memory_BxAxC, preserve_content_BxAxC)
 
         return memory_BxAxC
@@ -106,7 +106,7 @@ class ThalNetModel(SequentialModel):
         if self.app_state.visualize:
             self.cell_state_history = []
 
-        output = None
+        outputs = []
         batch_size = inputs.size(0)
         seq_length = inputs.size(-2)
 
@@ -119,13 +119,8 @@ class ThalNetModel(SequentialModel):
             if output_cell is None:
                 continue
 
-            output_cell = output_cell[..., None, :]
-            if output is None:
-                output = output_cell
-
-            # concatenate output
-            else:
-                output = torch.cat([output, output_cell], dim=-2)
+            # Collect outputs - they will be stacked once, after the loop.
+            outputs.append(output_cell)
 
             # This is for the time plot
             if self.app_state.visualize:
@@ -135,6 +130,9 @@ class ThalNetModel(SequentialModel):
                     [cell_state[i][1].hidden_state.detach().numpy()
                      for i in range(self.num_modules)])
 
+        # Stack outputs along the time axis (-2).
+        output = torch.stack(outputs, dim=-2) if outputs else None
+
         return output
 
     def generate_figure_layout(self):
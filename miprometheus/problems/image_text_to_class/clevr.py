@@ -47,7 +47,6 @@
 """
 __author__ = "Vincent Marois"
 
-import matplotlib.pyplot as plt
 from torch.utils.data import DataLoader
 
 import torch
@@ -831,6 +830,8 @@ class CLEVR(ImageTextToClassProblem):
         :param sample: sample index to visualize.
         :type sample: int
         """
+        import matplotlib.pyplot as plt
+
         # create plot figures
         plt.figure(1)
 
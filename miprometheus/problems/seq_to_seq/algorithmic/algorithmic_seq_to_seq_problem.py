@@ -459,7 +459,7 @@ class AlgorithmicSeqToSeqProblem(SeqToSeqProblem):
         :param logits: Predictions of the model.
         :type logits: tensor
 
-        :return: Accuracy.
+        :return: Accuracy (float).
 
         """
         # Check if mask should be is used - if so, apply.
@@ -467,7 +467,10 @@ class AlgorithmicSeqToSeqProblem(SeqToSeqProblem):
             return self.loss_function.masked_accuracy(
                 logits, data_dict['targets'], data_dict['masks'])
         else:
-            return (1 - torch.abs(torch.round(torch.nn.functional.sigmoid(logits)) - data_dict['targets'])).mean()
+            # round(sigmoid(x)) == (x > 0), so predictions are obtained with a single comparison.
+            targets = data_dict['targets']
+            # Return a Python float (single .item() call) - as masked_accuracy() does.
+            return (logits > 0).type_as(targets).eq(targets).type_as(targets).mean().item()
 
 
 
@@ -707,8 +710,9 @@ class AlgorithmicSeqToSeqProblem(SeqToSeqProblem):
 
         stat_agg['acc_min'] = min(stat_col['acc'])
         stat_agg['acc_max'] = max(stat_col['acc'])
-        stat_agg['acc'] = torch.mean(torch.tensor(stat_col['acc']))
-        stat_agg['acc_std'] = 0.0 if len(stat_col['acc']) <= 1 else torch.std(torch.tensor(stat_col['acc']))
+        accuracies = torch.tensor(stat_col['acc'])
+        stat_agg['acc'] = torch.mean(accuracies).item()
+        stat_agg['acc_std'] = 0.0 if len(stat_col['acc']) <= 1 else torch.std(accuracies).item()
         stat_agg['samples_aggregated'] = sum(stat_col['batch_size'])
 
     def show_sample(self, data_dict, sample=0):
@@ -752,11 +756,11 @@ class AlgorithmicSeqToSeqProblem(SeqToSeqProblem):
         #print("\nnum_subsequences:", data_dict['num_subsequences'])
 
         # show data.
-        ax1.imshow(np.transpose(data_dict['sequences'][sample, :, :], [1, 0]),
+        ax1.imshow(data_dict['sequences'][sample].detach().permute(1, 0).numpy(),
                 interpolation='nearest', aspect='auto')
-        ax2.imshow(np.transpose(data_dict['targets'][sample, :, :], [1, 0]),
+        ax2.imshow(data_dict['targets'][sample].detach().permute(1, 0).numpy(),
                 interpolation='nearest', aspect='auto')
-        ax3.imshow(np.transpose(data_dict['masks'][sample, :, :], [1, 0]), 
+        ax3.imshow(data_dict['masks'][sample].detach().permute(1, 0).numpy(),
                 interpolation='nearest', aspect='auto')
         # Plot!
         matplotlib.pyplot.tight_layout()
@@ -19,7 +19,7 @@ __author__ = "Younes Bouhadjar & Vincent Marois"
 
 import torch
 import numpy as np
-from miprometheus.utils.data_dict import DataDict
+from collections import OrderedDict
 from miprometheus.problems.seq_to_seq.algorithmic.algorithmic_seq_to_seq_problem import AlgorithmicSeqToSeqProblem
 
 
@@ -76,157 +76,165 @@ class InterruptionNot(AlgorithmicSeqToSeqProblem):
                                'num_subseq_max': self.num_subseq_max,
                                }
 
-    def __getitem__(self, index):
+        # Control channel markers (constant, so created once): start of x, start of y, start of dummies
+        # and separator of the dummies of ys and xs.
+        self.marker_x = np.zeros(self.control_bits, dtype=np.uint8)
+        self.marker_x[0] = 1  # [1, 0, 0, 0]
+        self.marker_y = np.zeros(self.control_bits, dtype=np.uint8)
+        self.marker_y[1] = 1  # [0, 1, 0, 0]
+        self.marker_dummy = np.zeros(self.control_bits, dtype=np.uint8)
+        self.marker_dummy[2] = 1  # [0, 0, 1, 0]
+        self.marker_inter = np.zeros(self.control_bits, dtype=np.uint8)
+        self.marker_inter[3] = 1  # [0, 0, 0, 1]
+
+        # Random generator used by generate_batch() - seeded from the global NumPy random state,
+        # so the generation is still reproducible when the NumPy seed is set by the worker.
+        # The seed sequence is kept in order to derive independent streams for the dataloader workers
+        # (which run generate_batch() through collate_fn or __getitem__, depending on the generation mode).
+        self.seed_sequence = np.random.SeedSequence(np.random.randint(2 ** 31))
+        self.rng = np.random.default_rng(self.seed_sequence)
+
+        # Cache of the layouts of the inputs, keyed by the lengths of the subsequences.
+        # Limited in size (least recently used layouts are evicted), as the number of possible
+        # combinations of lengths can be huge.
+        self.layout_cache = OrderedDict()
+        self.layout_cache_size = 1024
+
+    def worker_init_fn(self, worker_id):
         """
-        Getter that returns one individual sample generated on-the-fly
+        Function to be called by :py:class:`torch.utils.data.DataLoader` on each worker subprocess, \
+        after seeding and before data loading.
 
-        .. note::
+        Calls the parent ``worker_init_fn`` and additionally replaces the random generator used by \
+        :py:func:`generate_batch` in the worker with an independent stream, derived from the seed sequence of the problem, the worker id and the \
+        torch seed of the worker (which changes with every iterator created over the ``DataLoader``, \
+        so every epoch gets different batches).
 
-            The sequence length is drawn randomly between ``self.min_sequence_length`` and \
-            ``self.max_sequence_length``.
+        :param worker_id: the worker id (in [0, :py:class:`torch.utils.data.DataLoader`.num_workers - 1])
+        :type worker_id: int
 
+        """
+        super(InterruptionNot, self).worker_init_fn(worker_id)
 
-        :param index: index of the sample to return.
+        # Child of the seed sequence of the problem, specific to this worker and this iterator.
+        self.rng = np.random.default_rng(np.random.SeedSequence(
+            self.seed_sequence.entropy, spawn_key=(worker_id, torch.initial_seed())))
 
-        :return: DataDict({'sequences', 'sequences_length', 'targets', 'mask', 'num_subsequences'}), with:
+    def add_markers(self, ctrl, offsets, lens, marker):
+        """
+        Writes the start markers of a whole list of subsequences into the control bits and returns \
+        the time steps of their items (so that all the items can be written at once, or left as zeros for dummies).
 
-            - sequences: [SEQ_LENGTH, CONTROL_BITS+DATA_BITS],
-            - **sequences_length: random value between self.min_sequence_length and self.max_sequence_length**
-            - targets: [SEQ_LENGTH, DATA_BITS],
-            - mask: [SEQ_LENGTH]
-            - num_subsequences: 1
+        :param ctrl: Control bits [1 x TOTAL_LENGTH x CONTROL_BITS] (modified in place).
+        :type ctrl: numpy 3d array
 
-        pattern of inputs: # x1 % y1 & d1 # x2 % y2 & d2 ... # xn % yn & dn $ d`
-        pattern of target:    d   d    y1   d    d    y2  ...   d   d    yn   all(xi)
-        mask: used to mask the data part of the target.
-        xi, yi, and dn(d'): sub sequences x of random length, sub sequence y of random length and dummies.
+        :param offsets: Time steps of the start markers [NUM_SUBSEQ].
+        :type offsets: numpy 1d array
+
+        :param lens: Lengths of the subsequences [NUM_SUBSEQ].
+        :type lens: numpy 1d array
 
-        # TODO: THE DOCUMENTATION NEEDS TO BE UPDATED
-        # TODO: This is commented for now to avoid the issue with `add_ctrl` and `augment` in AlgorithmicSeqToSeqProblem
-        # TODO: NOT SURE THAT THIS FN IS WORKING WELL (WITHOUT THE PRESENCE OF THE BATCH DIMENSION)
+        :param marker: Control bits of the start marker [CONTROL_BITS].
+        :type marker: numpy 1d array
+
+        :return: Time steps of all the items of the subsequences [SUM(LENS)].
 
         """
-        '''
-        # define control channel markers
-        pos = [0, 0, 0, 0]
-        ctrl_data = [0, 0, 0, 0]
-        ctrl_dummy = [0, 0, 1, 0]
-        ctrl_inter = [0, 0, 0, 1]
-        # assign markers
-        markers = ctrl_data, ctrl_dummy, pos
+        # Time steps of the items: i-th subsequence spans offsets[i]+1 ... offsets[i]+lens[i].
+        steps = np.repeat(offsets + 1 - (np.cumsum(lens) - lens), lens) + np.arange(lens.sum())
 
-        # number of sub_sequences
-        nb_sub_seq_a = np.random.randint(
-            self.num_subseq_min, self.num_subseq_max + 1)
-        # might be different in future implementation
-        nb_sub_seq_b = nb_sub_seq_a
+        # Write all the markers at once.
+        ctrl[:, offsets] = marker
 
-        # set the sequence length of each marker
-        seq_lengths_a = np.random.randint(
-            low=self.min_sequence_length,
-            high=self.max_sequence_length + 1,
-            size=nb_sub_seq_a)
-        seq_lengths_b = np.random.randint(
-            low=self.min_sequence_length,
-            high=self.max_sequence_length + 1,
-            size=nb_sub_seq_b)
+        return steps
 
-        #  generate subsequences for x and y
-        x = [
-            np.random.binomial(
-                1,
-                self.bias,
-                (n,
-                 self.data_bits)) for n in seq_lengths_a]
-        y = [
-            np.random.binomial(
-                1,
-                self.bias,
-                (n,
-                 self.data_bits)) for n in seq_lengths_b]
-        # NOT y
-        yr = [np.logical_not(yr) for yr in y]
-
-        # create the target
-        target = np.concatenate(yr + x, axis=1)
-
-        # add marker at the begging of x and dummies of same length,  also a
-        # marker at the begging of dummies is added
-        xx = [self.augment(seq, markers, ctrl_start=[
-            1, 0, 0, 0], add_marker_data=True) for seq in x]
-        # add marker at the begging of y and dummies of same length, also a
-        # marker at the begging of dummies is added
-        yy = [self.augment(seq, markers, ctrl_start=[
-            0, 1, 0, 0], add_marker_data=True) for seq in y]
-
-        # this is a marker to separate dummies of x and y at the end of the
-        # sequence
-        inter_seq = self.add_ctrl(
-            np.zeros((1, self.data_bits)), ctrl_inter, pos)
-
-        # data which contains all xs and all ys plus dummies of ys
-        data_1 = [arr for a, b in zip(xx, yy) for arr in a[:-1] + b]
-
-        # dummies of xs
-        data_2 = [a[-1][:, 1:, :] for a in xx]
-
-        # concatenate all parts of the inputs
-        inputs = np.concatenate(data_1 + [inter_seq] + data_2, axis=1)
-
-        # PyTorch variables
-        inputs = torch.from_numpy(inputs).type(self.app_state.dtype)
-        target = torch.from_numpy(target).type(self.app_state.dtype)
+    def get_layout(self, seq_lengths_a, seq_lengths_b):
+        """
+        Returns the layout of the inputs, which depends only on the lengths of the subsequences. \
+        Layouts are cached, so in runs with a small range of lengths they are computed only once.
 
-        # create the mask
-        mask_all = inputs[:, 0:self.control_bits] == 1
-        mask = mask_all[..., 0]
-        for i in range(self.control_bits):
-            mask = mask_all[..., i] * mask
+        pattern of inputs: # x1 % y1 & d1 # x2 % y2 & d2 ... # xn % yn & dn $ d`
 
-        # rest ctrl channel of dummies
-        inputs[mask[0], 0:self.control_bits] = 0
+        :param seq_lengths_a: Lengths of the subsequences x [NUM_SUBSEQ].
+        :type seq_lengths_a: numpy 1d array
 
-        # Create the target with the dummies
-        target_with_dummies = torch.zeros_like(
-            inputs[:, self.control_bits:])
-        target_with_dummies[:, mask[0], :] = target
+        :param seq_lengths_b: Lengths of the subsequences y [NUM_SUBSEQ].
+        :type seq_lengths_b: numpy 1d array
 
-        # Return data_dict.
-        data_dict = DataDict({key: None for key in self.data_definitions.keys()})
-        data_dict['sequences'] = inputs
-        data_dict['sequences_length'] = max(seq_lengths_a)
-        data_dict['targets'] = target_with_dummies
-        data_dict['mask'] = mask
-        data_dict['num_subsequences'] = nb_sub_seq_a + nb_sub_seq_b
-        '''
-        return DataDict({key: None for key in self.data_definitions.keys()})  # data_dict
+        :return: Tuple (ctrl, x_steps, y_steps, mask0, mask_steps), with:
+
+            - ctrl: control bits of all time steps [TOTAL_LENGTH, CONTROL_BITS],
+            - x_steps: time steps of the items of xs [SUM(A)],
+            - y_steps: time steps of the items of ys [SUM(B)],
+            - mask0: mask of a single sample [TOTAL_LENGTH],
+            - mask_steps: time steps selected by the mask [SUM(A)+SUM(B)].
 
-    def collate_fn(self, batch):
         """
-        Generates a batch of samples on-the-fly
+        key = (tuple(seq_lengths_a), tuple(seq_lengths_b))
+        layout = self.layout_cache.get(key)
+        if layout is not None:
+            # Mark as the most recently used.
+            self.layout_cache.move_to_end(key)
+            return layout
+
+        # every pair of subsequences occupies [marker x, x, marker y, y, marker dummy, dummies of y],
+        # followed by the inter marker and the dummies of all xs (without their markers)
+        pair_lens = seq_lengths_a + 2 * seq_lengths_b + 3
+        x_markers = np.cumsum(pair_lens) - pair_lens
+        y_markers = x_markers + seq_lengths_a + 1
+        dummy_markers = y_markers + seq_lengths_b + 1
+        inter_marker = pair_lens.sum()
+
+        # total length of the inputs
+        total_in = inter_marker + 1 + seq_lengths_a.sum()
+
+        # control bits of a single sample - markers written by add_markers
+        ctrl = np.zeros((1, total_in, self.control_bits), dtype=np.uint8)
+
+        # the mask depends only on the lengths of the subsequences: it selects the dummies of ys and xs,
+        # i.e. the time steps where the target (NOT y followed by x) has to be returned
+        mask0 = np.zeros(total_in, dtype=np.uint8)
+
+        # markers of xs and ys
+        x_steps = self.add_markers(ctrl, x_markers, seq_lengths_a, self.marker_x)
+        y_steps = self.add_markers(ctrl, y_markers, seq_lengths_b, self.marker_y)
+
+        # dummies of ys (zeros) with their markers
+        mask0[self.add_markers(ctrl, dummy_markers, seq_lengths_b, self.marker_dummy)] = 1
+
+        # marker separating dummies of ys and dummies of xs - followed by dummies of xs (zeros)
+        ctrl[:, inter_marker] = self.marker_inter
+        mask0[inter_marker + 1:] = 1
+
+        layout = (ctrl[0], x_steps, y_steps, mask0, np.flatnonzero(mask0))
+        self.layout_cache[key] = layout
+        if len(self.layout_cache) > self.layout_cache_size:
+            # Evict the least recently used layout.
+            self.layout_cache.popitem(last=False)
+        return layout
+
+    def generate_batch(self, batch_size):
+        """
+        Generates a batch of samples of size ''batch_size'' on-the-fly.
 
-        .. warning::
-            Because of the fact that the sequence length is randomly drawn between ``self.min_sequence_length`` and \
-            ``self.max_sequence_length`` and then fixed for one given batch (**but varies between batches**), \
-            we cannot follow the scheme `merge together individuals samples that can be retrieved in parallel with\
-            several workers.` Indeed, each sample could have a different sequence length, and merging them together\
-            would then not be possible (we cannot have variable-sequence-length samples within one batch \
-            without padding).
-            Hence, ``collate_fn`` generates on-the-fly a batch of samples, all having the same length (initially\
-            randomly selected).
-            The samples created by ``__getitem__`` are simply not used in this function.
+        .. note::
 
+            The number of subsequences and their lengths are drawn randomly (between ``self.num_subseq_min`` \
+            and ``self.num_subseq_max``, and between ``self.min_sequence_length`` and \
+            ``self.max_sequence_length`` respectively).
+
+        .. warning::
+            All the samples within the batch will have the same layout (i.e. the same subsequence lengths).
 
-        :param batch: Should be a list of DataDict retrieved by `__getitem__`, each containing tensors, numbers,\
-        dicts or lists. --> **Not Used Here!**
+        :param batch_size: Size of the batch to be returned.
 
-        :return: DataDict({'sequences', 'sequences_length', 'targets', 'mask', 'num_subsequences'}), with:
+        :return: DataDict({'sequences', 'sequences_length', 'targets', 'masks', 'num_subsequences'}), with:
 
-            - sequences: [BATCH_SIZE, 2*SEQ_LENGTH+2, CONTROL_BITS+DATA_BITS],
-            - **sequences_length: random value between self.min_sequence_length and self.max_sequence_length**
-            - targets: [BATCH_SIZE, 2*SEQ_LENGTH+2, DATA_BITS],
-            - mask: [BATCH_SIZE, [2*SEQ_LENGTH+2]
-            - num_subsequences: 1
+            - sequences: [BATCH_SIZE, TOTAL_LENGTH, CONTROL_BITS+DATA_BITS],
+            - sequences_length: [BATCH_SIZE, 1] (the same value for all samples: the length of the longest x)
+            - targets: [BATCH_SIZE, TOTAL_LENGTH, DATA_BITS],
+            - masks: [BATCH_SIZE, TOTAL_LENGTH, 1]
+            - num_subsequences: [BATCH_SIZE, 1] (the same value for all samples: number of xs and ys)
 
         pattern of inputs: # x1 % y1 & d1 # x2 % y2 & d2 ... # xn % yn & dn $ d`
         pattern of target:    d   d    y1   d    d    y2  ...   d   d    yn   all(xi)
@@ -236,103 +244,73 @@ class InterruptionNot(AlgorithmicSeqToSeqProblem):
         # TODO: THE DOCUMENTATION NEEDS TO BE UPDATED & IMPROVED
 
         """
-        # get the batch_size
-        batch_size = len(batch)
-
-        # define control channel markers
-        pos = [0, 0, 0, 0]
-        ctrl_data = [0, 0, 0, 0]
-        ctrl_dummy = [0, 0, 1, 0]
-        ctrl_inter = [0, 0, 0, 1]
-
-        # assign markers
-        markers = ctrl_data, ctrl_dummy, pos
-
         # number of sub_sequences
-        nb_sub_seq_a = np.random.randint(
+        nb_sub_seq_a = self.rng.integers(
             self.num_subseq_min, self.num_subseq_max + 1)
         # might be different in future implementation
         nb_sub_seq_b = nb_sub_seq_a
 
         # set the sequence length of each marker
-        seq_lengths_a = np.random.randint(
+        seq_lengths_a = self.rng.integers(
             low=self.min_sequence_length,
             high=self.max_sequence_length + 1,
             size=nb_sub_seq_a)
-        seq_lengths_b = np.random.randint(
+        seq_lengths_b = self.rng.integers(
             low=self.min_sequence_length,
             high=self.max_sequence_length + 1,
             size=nb_sub_seq_b)
 
-        #  generate subsequences for x and y
-        x = [
-            np.random.binomial(
-                1,
-                self.bias,
-                (batch_size,
-                 n,
-                 self.data_bits)) for n in seq_lengths_a]
-        y = [
-            np.random.binomial(
-                1,
-                self.bias,
-                (batch_size,
-                 n,
-                 self.data_bits)) for n in seq_lengths_b]
-        # NOT y
-        yr = [np.logical_not(yr) for yr in y]
-
-        # create the target
-        target = np.concatenate(yr + x, axis=1)
-
-        # add marker at the begging of x and dummies of same length,  also a
-        # marker at the begging of dummies is added
-        xx = [self.augment(seq, markers, ctrl_start=[
-            1, 0, 0, 0], add_marker_data=True) for seq in x]
-        # add marker at the begging of y and dummies of same length, also a
-        # marker at the begging of dummies is added
-        yy = [self.augment(seq, markers, ctrl_start=[
-            0, 1, 0, 0], add_marker_data=True) for seq in y]
-
-        # this is a marker to separate dummies of x and y at the end of the
-        # sequence
-        inter_seq = self.add_ctrl(
-            np.zeros((batch_size, 1, self.data_bits)), ctrl_inter, pos)
-
-        # data which contains all xs and all ys plus dummies of ys
-        data_1 = [arr for a, b in zip(xx, yy) for arr in a[:-1] + b]
-
-        # dummies of xs
-        data_2 = [a[-1][:, 1:, :] for a in xx]
-
-        # concatenate all parts of the inputs
-        inputs = np.concatenate(data_1 + [inter_seq] + data_2, axis=1)
-
-        # PyTorch variables
+        # generate all subsequences for x and y at once [BATCH_SIZE, SUM(A)+SUM(B), DATA_BITS]
+        all_lens = np.concatenate([seq_lengths_a, seq_lengths_b])
+        bits = (self.rng.random((batch_size, all_lens.sum(), self.data_bits), dtype=np.float32) < self.bias
+                ).astype(np.uint8)
+
+        # split the single buffer into x (first sum(A) items) and y (remaining sum(B) items)
+        total_a = seq_lengths_a.sum()
+        x_block, y_block = bits[:, :total_a], bits[:, total_a:]
+
+        # create the target directly as a tensor: NOT y followed by x [BATCH_SIZE, SUM(B)+SUM(A), DATA_BITS]
+        # (torch.from_numpy returns views sharing memory with the bit buffer, so no numpy concatenation is needed)
+        total_b = seq_lengths_b.sum()
+        target = torch.empty(batch_size, total_a + total_b, self.data_bits).type(self.app_state.dtype)
+        target[:, :total_b] = 1 - torch.from_numpy(y_block)
+        target[:, total_b:] = torch.from_numpy(x_block)
+
+        # layout of the inputs (markers, time steps of the items and mask) - cached
+        ctrl, x_steps, y_steps, mask0, mask_steps = self.get_layout(seq_lengths_a, seq_lengths_b)
+        total_in = mask0.shape[0]
+
+        # preallocate the inputs [BATCH_SIZE, TOTAL_LENGTH, CONTROL_BITS+DATA_BITS]
+        # the dummies are all zeros, so only the markers and the items of xs and ys are written
+        # (all values are bits, so the inputs are kept as uint8 and cast to dtype only once at the end)
+        inputs = np.zeros((batch_size, total_in, self.control_bits + self.data_bits), dtype=np.uint8)
+        inputs[:, :, 0:self.control_bits] = ctrl
+
+        # data which contains all xs and all ys
+        inputs[:, x_steps, self.control_bits:] = x_block
+        inputs[:, y_steps, self.control_bits:] = y_block
+
+        # PyTorch variables - single cast from uint8
         inputs = torch.from_numpy(inputs).type(self.app_state.dtype)
-        target = torch.from_numpy(target).type(self.app_state.dtype)
-
-        # create the mask
-        mask_all = inputs[:, :, 0:self.control_bits] == 1
-        mask = mask_all[..., 0]
-        for i in range(self.control_bits):
-            mask = mask_all[..., i] * mask
 
-        # rest ctrl channel of dummies
-        inputs[:, mask[0], 0:self.control_bits] = 0
+        # the mask is the same for all samples in the batch - broadcast it [BATCH_SIZE, TOTAL_LENGTH, 1]
+        # (copied once, so the cached layout cannot be modified through the returned tensor)
+        mask = torch.from_numpy(mask0.copy()).type(self.app_state.ByteTensor).view(1, total_in, 1).expand(
+            batch_size, total_in, 1)
 
-        # Create the target with the dummies
+        # Create the target with the dummies - copy the target items to the masked time steps
         target_with_dummies = torch.zeros_like(
             inputs[:, :, self.control_bits:])
-        target_with_dummies[:, mask[0], :] = target
+        target_with_dummies.index_copy_(
+            1, torch.from_numpy(mask_steps).type(self.app_state.LongTensor), target)
 
         # Return data_dict.
-        data_dict = DataDict({key: None for key in self.data_definitions.keys()})
+        data_dict = self.create_data_dict()
         data_dict['sequences'] = inputs
-        data_dict['sequences_length'] = max(seq_lengths_a)
+        data_dict['sequences_length'] = torch.ones([batch_size, 1]).type(torch.IntTensor) * int(max(seq_lengths_a))
         data_dict['targets'] = target_with_dummies
-        data_dict['mask'] = mask
-        data_dict['num_subsequences'] = nb_sub_seq_a + nb_sub_seq_b
+        data_dict['masks'] = mask
+        data_dict['num_subsequences'] = torch.ones([batch_size, 1]).type(torch.CharTensor) * int(nb_sub_seq_a + nb_sub_seq_b)
 
         return data_dict
 
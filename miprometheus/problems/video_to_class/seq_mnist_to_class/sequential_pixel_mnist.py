@@ -90,9 +90,8 @@ class SequentialPixelMNIST(VideoToClassProblem):
 
         self.name = 'SequentialPixelMNIST'
 
-        # define transforms
-        transform = transforms.Compose([transforms.ToTensor(),
-                                        transforms.Lambda(lambda x: x.view(-1))])
+        # define transforms - the image is reshaped into a sequence of pixels in __getitem__ (view, no copy)
+        transform = transforms.ToTensor()
 
         # load the dataset
         self.dataset = datasets.MNIST(self.root_dir, train=self.use_train_data,
@@ -101,6 +100,10 @@ class SequentialPixelMNIST(VideoToClassProblem):
         # Class names.
         self.labels = 'Zero One Two Three Four Five Six Seven Eight Nine'.split(' ')
 
+        # Create the mask - the same for all samples (only the last pixel of the sequence is used).
+        self.mask = torch.IntTensor(self.num_rows * self.num_columns, 1).zero_()
+        self.mask[-1, 0] = 1
+
         self.length = len(self.dataset)
 
     def __getitem__(self, index):
@@ -123,13 +126,9 @@ class SequentialPixelMNIST(VideoToClassProblem):
         # get label
         label = self.labels[target.data]
 
-        # create mask
-        mask = torch.IntTensor(self.num_rows * self.num_columns,1).zero_()
-        mask[-1, 0] = 1
-
         data_dict = DataDict({key: None for key in self.data_definitions.keys()})
         data_dict['images'] = img.view(28*28,1,1,1)
-        data_dict['mask'] = mask
+        data_dict['mask'] = self.mask
         data_dict['targets'] = target.expand((28*28,1))
         data_dict['targets_label'] = label
 
@@ -1,6 +1,7 @@
 from .app_state import AppState
 from .param_interface import ParamInterface
 from .param_registry import MetaSingletonABC, ParamRegistry
+from .prefetch_loader import PrefetchLoader
 from .sampler_factory import SamplerFactory
 from .singleton import SingletonMetaClass
 from .split_indices import split_indices
@@ -20,6 +21,7 @@ __all__ = [
     'ParamInterface',
     'MetaSingletonABC',
     'ParamRegistry',
+    'PrefetchLoader',
     'SamplerFactory',
     'SingletonMetaClass',
     'split_indices',
@@ -77,11 +77,11 @@ class MaskedBCEWithLogitsLoss(Module):
         # Set the loss per element to zero for unneeded output
         masked_loss_per = mask_float * loss_per_element
 
-        # obtain the number of non-zero elements in the mask.
-        # nonzero() returns the indices so you have to divide by the number of dimensions
+        # obtain the number of non-zero elements in the mask
+        # (counted directly, without materializing their indices).
         # The mask lacks the last dimension of the targets so needs to be
         # scaled up
-        size = mask.nonzero().numel() / len(mask.shape) * logits.shape[-1]
+        size = (mask != 0).sum().item() * logits.shape[-1]
 
         loss = torch.sum(masked_loss_per) / size
 
@@ -111,7 +111,8 @@ class MaskedBCEWithLogitsLoss(Module):
         """
 
         # calculate the accuracy per bit in the sequences
-        acc_per = 1 - torch.abs(torch.round(torch.nn.functional.sigmoid(logits)) - targets)
+        # (round(sigmoid(x)) == (x > 0), so a single comparison replaces sigmoid and round)
+        acc_per = (logits > 0).type_as(targets).eq(targets).type_as(targets)
 
         mask_float = mask.type(AppState().dtype)
         if len(mask.shape) < len(logits.shape):
@@ -119,7 +120,7 @@ class MaskedBCEWithLogitsLoss(Module):
 
         # The mask lacks the last dimension of the targets so needs to be
         # scaled up
-        size = mask.nonzero().numel() / len(mask.shape) * logits.shape[-1]
+        size = (mask != 0).sum().item() * logits.shape[-1]
 
         masked_acc_per = mask_float * acc_per
 
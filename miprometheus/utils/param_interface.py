@@ -21,6 +21,12 @@ import yaml
 from collections import Mapping
 from miprometheus.utils.param_registry import ParamRegistry
 
+# Use the (much faster) libyaml-based safe loader when PyYAML was built with it.
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:
+    from yaml import SafeLoader as YamlLoader
+
 
 class ParamInterface(Mapping):
     """
@@ -280,7 +286,7 @@ class ParamInterface(Mapping):
         # Open file and try to add that to list of parameter dictionaries.
         with open(yaml_path, 'r') as stream:
             # Load parameters.
-            params_from_yaml = yaml.safe_load(stream)
+            params_from_yaml = yaml.load(stream, Loader=YamlLoader)
 
         # add config param
         self.add_config_params(params_from_yaml)
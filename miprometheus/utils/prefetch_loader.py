@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) IBM Corporation 2018
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+prefetch_loader.py:
+
+    - Contains the definition of the ``PrefetchLoader`` class, wrapping a ``DataLoader`` so that batches are \
+    generated on a background thread.
+
+"""
+__author__ = "Tomasz Kornuta"
+
+import queue
+import threading
+
+
+class PrefetchLoader(object):
+    """
+    Wraps a :py:class:`torch.utils.data.DataLoader` and iterates over it on a background thread, storing up to \
+    ``num_prefetch`` batches in a queue.
+
+    This way the generation of the next batches (e.g. on-the-fly generation done in ``collate_fn`` of the \
+    algorithmic problems) overlaps with the forward/backward pass of the model on the current one.
+
+    .. note::
+
+        All other attributes (e.g. ``dataset``, ``batch_size``) are forwarded to the wrapped ``DataLoader``.
+
+    .. warning::
+
+        Batches are generated ahead of their use, so changes of the problem parameters made in the meantime \
+        (e.g. by curriculum learning) affect only the batches generated afterwards. Hence the workers do not \
+        prefetch when curriculum learning is active.
+
+    """
+
+    # Marks the end of the iteration over the wrapped loader.
+    _END = object()
+
+    def __init__(self, loader, num_prefetch=2):
+        """
+        Stores the wrapped loader.
+
+        :param loader: Loader to be wrapped.
+        :type loader: :py:class:`torch.utils.data.DataLoader`
+
+        :param num_prefetch: Maximum number of batches generated in advance (DEFAULT: 2).
+        :type num_prefetch: int
+
+        """
+        self.loader = loader
+        self.num_prefetch = num_prefetch
+
+    def __len__(self):
+        """
+        :return: Length of the wrapped loader.
+        """
+        return len(self.loader)
+
+    def __getattr__(self, name):
+        """
+        Forwards the access to attributes which are not defined here to the wrapped loader.
+
+        Raises ``AttributeError`` if the wrapped loader is not set (yet), e.g. during copying or unpickling.
+        """
+        try:
+            loader = self.__dict__['loader']
+        except KeyError:
+            raise AttributeError(name)
+        return getattr(loader, name)
+
+    def __iter__(self):
+        """
+        Starts the background thread and yields the batches it has put in the queue.
+
+        Exceptions raised in the background thread are re-raised in the calling one.
+
+        """
+        batches = queue.Queue(maxsize=self.num_prefetch)
+        stop = threading.Event()
+
+        def put(item):
+            # Do not block forever if the consumer stopped iterating.
+            while not stop.is_set():
+                try:
+                    batches.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def produce():
+            try:
+                for batch in self.loader:
+                    if not put((batch, None)):
+                        return
+            except Exception as e:
+                put((None, e))
+            put((self._END, None))
+
+        thread = threading.Thread(target=produce, daemon=True)
+        thread.start()
+
+        try:
+            while True:
+                batch, exception = batches.get()
+                if exception is not None:
+                    raise exception
+                if batch is self._END:
+                    return
+                yield batch
+        finally:
+            stop.set()
@@ -44,6 +44,12 @@ class StatisticsCollector(Mapping):
         self.tb_writer = None
         self.csv_file = None
 
+        # The csv file is block-buffered and flushed every csv_flush_interval rows.
+        self.csv_flush_interval = 256
+        self.csv_rows = 0
+        # Bound formatting functions of all statistics, gathered on first use (see export_to_csv()).
+        self.csv_formatters = None
+
         self.statistics = dict()
         self.formatting = dict()
 
@@ -63,6 +69,9 @@ class StatisticsCollector(Mapping):
         # instantiate associated value as list.
         self.statistics[key] = list()
 
+        # The set of statistics changed - the csv formatters must be gathered again.
+        self.csv_formatters = None
+
     def __getitem__(self, key):
         """
         Get statistics value for given key.
@@ -94,6 +103,9 @@ class StatisticsCollector(Mapping):
         """
         del self.statistics[key]
 
+        # The set of statistics changed - the csv formatters must be gathered again.
+        self.csv_formatters = None
+
     def __len__(self):
         """
         Returns "length" of ``self.statistics`` (i.e. number of tracked values).
@@ -137,9 +149,10 @@ class StatisticsCollector(Mapping):
         # Remove last coma and add \n.
         header_str = header_str[:-1] + '\n'
 
-        # Open file for writing.
-        self.csv_file = open(log_dir + filename, 'w', 1)
+        # Open file for writing (block-buffered, see export_to_csv()).
+        self.csv_file = open(log_dir + filename, 'w')
         self.csv_file.write(header_str)
+        self.csv_rows = 0
 
         return self.csv_file
 
@@ -157,19 +170,18 @@ class StatisticsCollector(Mapping):
         if csv_file is None:
             return
 
-        # Iterate through values and concatenate them.
-        values_str = ''
-        for key, value in self.statistics.items():
-            # Get formatting - using '{}' as default.
-            format_str = self.formatting.get(key, '{}')
-
-            # Add value to string using formatting.
-            values_str += format_str.format(value[-1]) + ","
+        # Get the bound formatting functions of all statistics (using '{}' as default).
+        if self.csv_formatters is None:
+            self.csv_formatters = [self.formatting.get(key, '{}').format for key in self.statistics]
 
-        # Remove last coma and add \n.
-        values_str = values_str[:-1] + '\n'
+        # Format the last values of all statistics and join them into a single row.
+        csv_file.write(','.join(
+            format_fn(value[-1]) for format_fn, value in zip(self.csv_formatters, self.statistics.values())) + '\n')
 
-        csv_file.write(values_str)
+        # Flush from time to time, so the file can be still monitored during the experiment.
+        self.csv_rows += 1
+        if self.csv_rows % self.csv_flush_interval == 0:
+            csv_file.flush()
 
     def export_to_checkpoint(self):
         """
@@ -62,6 +62,21 @@ class Tester(Worker):
                                  dest='visualize',
                                  help='Activate dynamic visualization')
 
+        self.parser.add_argument('--threads',
+                                 dest='num_threads',
+                                 type=int,
+                                 default=0,
+                                 help='Number of threads used by torch for computations on CPU. '
+                                      '(DEFAULT: 0 - use the torch default)')
+
+        self.parser.add_argument('--cpus',
+                                 dest='cpus',
+                                 type=str,
+                                 default='',
+                                 help='Comma-separated list of CPU cores (or ranges of cores, e.g. 0-7) the process '
+                                      'will be pinned to, e.g. the cores of a single NUMA node (Linux only). '
+                                      '(DEFAULT: \'\' - no pinning)')
+
     def setup_global_experiment(self):
         """
         Sets up the global test experiment for the ``Tester``:
@@ -115,6 +130,27 @@ class Tester(Worker):
             self.logger.error("Cannot use GPU as there are no CUDA-compatible devices present in the system!")
             exit(-4)
 
+        # Set the number of threads used by torch (setting OMP_NUM_THREADS after importing torch has no effect).
+        if self.flags.num_threads > 0:
+            torch.set_num_threads(self.flags.num_threads)
+            self.logger.info('Setting the number of CPU threads to: {}'.format(self.flags.num_threads))
+
+        # Pin the process to the indicated cores, so that it does not migrate between NUMA nodes.
+        if self.flags.cpus != '':
+            if not hasattr(os, 'sched_setaffinity'):
+                self.logger.error('Pinning the process to CPU cores is not supported on this platform!')
+                exit(-5)
+            try:
+                cpus = set()
+                for item in self.flags.cpus.split(','):
+                    first, _, last = item.partition('-')
+                    cpus.update(range(int(first), int(last or first) + 1))
+                os.sched_setaffinity(0, cpus)
+            except (ValueError, OSError) as e:
+                self.logger.error("Cannot pin the process to CPU cores '{}': {}".format(self.flags.cpus, e))
+                exit(-5)
+            self.logger.info('Pinning the process to CPU cores: {}'.format(sorted(cpus)))
+
         # Get the list of configurations which need to be loaded.
         configs_to_load = self.recurrent_config_parse(config_file, [])
 
@@ -308,6 +344,11 @@ class Tester(Worker):
         self.logger.info('Testing over the entire test set ({} samples in {} episodes)'.format(
             num_samples, len(self.dataloader)))
 
+        # Look up the loop settings once, instead of at every episode.
+        max_test_episodes = self.params["testing"]["problem"]["max_test_episodes"]
+        logging_interval = self.flags.logging_interval
+        visualize = self.app_state.visualize
+
         try:
             # Run test
             with torch.no_grad():
@@ -315,7 +356,7 @@ class Tester(Worker):
                 episode = 0
                 for test_dict in self.dataloader:
 
-                    if episode == self.params["testing"]["problem"]["max_test_episodes"]:
+                    if episode == max_test_episodes:
                         break
 
                     # Evaluate model on a given batch.
@@ -326,10 +367,10 @@ class Tester(Worker):
                     self.testing_stat_col.export_to_csv()
 
                     # Log to logger - at logging frequency.
-                    if episode % self.flags.logging_interval == 0:
+                    if episode % logging_interval == 0:
                         self.logger.info(self.testing_stat_col.export_to_string('[Partial Test]'))
 
-                    if self.app_state.visualize:
+                    if visualize:
 
                         # Allow for preprocessing
                         test_dict, logits = self.problem.plot_preprocessing(test_dict, logits)
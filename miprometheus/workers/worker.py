@@ -42,7 +42,8 @@ from miprometheus.problems.problem_factory import ProblemFactory
 
 # Import utils.
 from miprometheus.utils.app_state import AppState
-from miprometheus.utils.param_interface import ParamInterface
+from miprometheus.utils.param_interface import ParamInterface, YamlLoader
+from miprometheus.utils.prefetch_loader import PrefetchLoader
 
 
 class Worker(object):
@@ -249,7 +250,10 @@ class Worker(object):
                                             'num_workers': 0,  # Do not use multiprocessing by default - for now.
                                             'pin_memory': False,
                                             'drop_last': False,
-                                            'timeout': 0},
+                                            'timeout': 0,
+                                            # Do not prefetch batches on a thread by default.
+                                            # (ignored with curriculum learning, see build_problem_sampler_loader())
+                                            'prefetch_batches': 0},
                             'sampler': {},  # not using sampler by default
                             }
 
@@ -294,6 +298,16 @@ class Worker(object):
                             timeout=params['dataloader']['timeout'],
                             worker_init_fn=problem.worker_init_fn)
 
+        # Generate the batches on a background thread, overlapping with the model computations.
+        if params['dataloader']['prefetch_batches'] > 0:
+            # Curriculum learning changes the parameters of the problem between episodes - batches generated
+            # in advance would still use the previous ones.
+            if 'curriculum_learning' in params:
+                self.logger.warning("Prefetching of batches for '{}' disabled, as it is incompatible with "
+                                    "curriculum learning".format(section_name))
+            else:
+                loader = PrefetchLoader(loader, params['dataloader']['prefetch_batches'])
+
         # Display sizes.
         self.logger.info("Problem for '{}' loaded (size: {})".format(section_name, len(problem)))
         if (sampler is not None):
@@ -531,7 +545,7 @@ class Worker(object):
             try:
                 # Open file and get parameter dictionary.
                 with open(config, 'r') as stream:
-                    param_dict = yaml.safe_load(stream)
+                    param_dict = yaml.load(stream, Loader=YamlLoader)
             except yaml.YAMLError as e:
                 print("Error: Couldn't properly parse the {} configuration file".format(config))
                 print('yaml.YAMLERROR:', e)